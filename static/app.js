@@ -0,0 +1,646 @@
+/* =============================================
+   Auth
+   ============================================= */
+var apiKey = '';
+try { apiKey = localStorage.getItem('speaches_api_key') || ''; } catch(e) {}
+
+/* The key only changes by reloading the page, so the headers are built once */
+var AUTH_HEADERS = {};
+var TTS_HEADERS = { 'Content-Type': 'application/json' };
+if (apiKey) {
+  AUTH_HEADERS['Authorization'] = TTS_HEADERS['Authorization'] = 'Bearer ' + apiKey;
+}
+
+function handleAuthError(res) {
+  if (res.status === 401) {
+    try { localStorage.removeItem('speaches_api_key'); } catch(e) {}
+    window.location.href = '/login';
+    return true;
+  }
+  return false;
+}
+
+function signOut() {
+  fetch('/auth/logout', { method: 'POST' }).finally(function() {
+    try { localStorage.removeItem('speaches_api_key'); } catch(e) {}
+    window.location.href = '/login';
+  });
+}
+
+/* =============================================
+   Tabs
+   ============================================= */
+var tabBtns = [document.getElementById('tabTranscribe'), document.getElementById('tabTTS')];
+var panels = [document.getElementById('panelTranscribe'), document.getElementById('panelTTS')];
+
+function switchTab(index) {
+  for (var i = 0; i < tabBtns.length; i++) {
+    tabBtns[i].setAttribute('aria-selected', i === index ? 'true' : 'false');
+    if (i === index) {
+      panels[i].classList.add('active');
+    } else {
+      panels[i].classList.remove('active');
+    }
+  }
+}
+
+/* =============================================
+   Utilities
+   ============================================= */
+function formatFileSize(bytes) {
+  if (bytes < 1024) return bytes + ' B';
+  if (bytes < 1024 * 1024) return (bytes / 1024).toFixed(1) + ' KB';
+  return (bytes / (1024 * 1024)).toFixed(1) + ' MB';
+}
+
+function showStatus(el, text, type) {
+  el.textContent = text;
+  el.className = 'status-msg ' + type;
+}
+
+function hideStatus(el) {
+  el.className = 'status-msg';
+  el.textContent = '';
+}
+
+function friendlyError(err) {
+  if (!err) return 'Something went wrong. Please try again.';
+  var msg = String(err.message || err);
+  if (msg.indexOf('Failed to fetch') !== -1 || msg.indexOf('NetworkError') !== -1) {
+    return 'Could not connect to the server. Please check your connection and try again.';
+  }
+  return msg;
+}
+
+/* fetch wrapper shared by the API calls: resolves with the response, or
+   null once handleAuthError has redirected; other failures reject with the
+   server's error detail */
+function apiCall(url, init, failMessage) {
+  return fetch(url, init).then(function(res) {
+    if (handleAuthError(res)) return null;
+    if (res.ok) return res;
+    return res.text().then(function(t) {
+      var detail = t;
+      try { var data = JSON.parse(t); detail = data.detail || data.message || t; } catch(e) {}
+      throw new Error(detail || failMessage + ' (status ' + res.status + ')');
+    });
+  });
+}
+
+function triggerDownload(blob, filename) {
+  var url = URL.createObjectURL(blob);
+  var a = document.createElement('a');
+  a.href = url;
+  a.download = filename;
+  document.body.appendChild(a);
+  a.click();
+  document.body.removeChild(a);
+  /* The download holds its own reference once started; drop ours when idle */
+  var revoke = function() { URL.revokeObjectURL(url); };
+  if (window.requestIdleCallback) {
+    requestIdleCallback(revoke, { timeout: 1000 });
+  } else {
+    setTimeout(revoke, 1000);
+  }
+}
+
+function copyToClipboard(text, btnSpan) {
+  var originalText = btnSpan.textContent;
+  if (navigator.clipboard && navigator.clipboard.writeText) {
+    navigator.clipboard.writeText(text).then(function() {
+      btnSpan.textContent = 'Copied';
+      setTimeout(function() { btnSpan.textContent = originalText; }, 2000);
+    }).catch(function() {
+      fallbackCopy(text, btnSpan, originalText);
+    });
+  } else {
+    fallbackCopy(text, btnSpan, originalText);
+  }
+}
+
+function fallbackCopy(text, btnSpan, originalText) {
+  var ta = document.createElement('textarea');
+  ta.value = text;
+  ta.style.position = 'fixed';
+  ta.style.opacity = '0';
+  document.body.appendChild(ta);
+  ta.select();
+  try {
+    document.execCommand('copy');
+    btnSpan.textContent = 'Copied';
+    setTimeout(function() { btnSpan.textContent = originalText; }, 2000);
+  } catch(e) {}
+  document.body.removeChild(ta);
+}
+
+/* =============================================
+   Transcribe — File handling
+   ============================================= */
+var dropZone = document.getElementById('dropZone');
+var dropIcon = document.getElementById('dropIcon');
+var dropText = document.getElementById('dropText');
+var fileInfo = document.getElementById('fileInfo');
+var fileInput = document.getElementById('fileInput');
+var fileNameEl = document.getElementById('fileName');
+var fileSizeEl = document.getElementById('fileSize');
+var transcribeBtn = document.getElementById('transcribeBtn');
+var transcribeSpinner = document.getElementById('transcribeSpinner');
+var transcribeBtnText = document.getElementById('transcribeBtnText');
+var transcribeStatus = document.getElementById('transcribeStatus');
+var transcribeResult = document.getElementById('transcribeResult');
+var resultText = document.getElementById('resultText');
+var copyBtn = document.getElementById('copyBtn');
+var downloadTextBtn = document.getElementById('downloadTextBtn');
+var transcribeCancelBtn = document.getElementById('transcribeCancelBtn');
+var langSelect = document.getElementById('langSelect');
+var formatSelect = document.getElementById('formatSelect');
+var preprocessToggle = document.getElementById('preprocessToggle');
+
+var selectedFile = null;
+var transcriptionText = '';
+
+function setFile(file) {
+  if (!file) { clearFile(); return; }
+  selectedFile = file;
+  fileNameEl.textContent = file.name;
+  fileSizeEl.textContent = formatFileSize(file.size);
+  dropZone.classList.add('has-file');
+  dropIcon.style.display = 'none';
+  dropText.style.display = 'none';
+  fileInfo.classList.add('visible');
+  transcribeBtn.disabled = false;
+  hideStatus(transcribeStatus);
+}
+
+function clearFile() {
+  selectedFile = null;
+  fileInput.value = '';
+  dropZone.classList.remove('has-file');
+  dropIcon.style.display = '';
+  dropText.style.display = '';
+  fileInfo.classList.remove('visible');
+  transcribeBtn.disabled = true;
+}
+
+fileInput.addEventListener('change', function() {
+  if (this.files && this.files[0]) setFile(this.files[0]);
+});
+
+/* Drag and drop */
+dropZone.addEventListener('dragover', function(e) {
+  e.preventDefault();
+  e.stopPropagation();
+  if (!dropZone.classList.contains('has-file')) {
+    dropZone.classList.add('dragover');
+  }
+});
+
+dropZone.addEventListener('dragleave', function(e) {
+  e.preventDefault();
+  e.stopPropagation();
+  dropZone.classList.remove('dragover');
+});
+
+dropZone.addEventListener('drop', function(e) {
+  e.preventDefault();
+  e.stopPropagation();
+  dropZone.classList.remove('dragover');
+  if (e.dataTransfer && e.dataTransfer.files && e.dataTransfer.files[0]) {
+    setFile(e.dataTransfer.files[0]);
+  }
+});
+
+/* =============================================
+   Transcribe — API call
+   ============================================= */
+/* Files above this size are uploaded as a streamed multipart body, so the
+   browser never holds the whole request in memory */
+var STREAM_UPLOAD_MIN = 10 * 1024 * 1024;
+
+var supportsRequestStreams = (function() {
+  var duplexAccessed = false;
+  try {
+    var hasContentType = new Request('', {
+      body: new ReadableStream(),
+      method: 'POST',
+      get duplex() { duplexAccessed = true; return 'half'; }
+    }).headers.has('Content-Type');
+    return duplexAccessed && !hasContentType;
+  } catch(e) {
+    return false;
+  }
+})();
+
+function multipartStream(boundary, fields, file) {
+  var encoder = new TextEncoder();
+  var head = '';
+  for (var name in fields) {
+    head += '--' + boundary + '\r\nContent-Disposition: form-data; name="' + name + '"\r\n\r\n' + fields[name] + '\r\n';
+  }
+  var filename = file.name.replace(/"/g, '%22').replace(/\r/g, '%0D').replace(/\n/g, '%0A');
+  head += '--' + boundary + '\r\nContent-Disposition: form-data; name="file"; filename="' + filename + '"\r\n' +
+    'Content-Type: ' + (file.type || 'application/octet-stream') + '\r\n\r\n';
+  var reader = null;
+  return new ReadableStream({
+    start: function(controller) { controller.enqueue(encoder.encode(head)); },
+    pull: function(controller) {
+      if (!reader) reader = file.stream().getReader();
+      return reader.read().then(function(chunk) {
+        if (chunk.done) {
+          controller.enqueue(encoder.encode('\r\n--' + boundary + '--\r\n'));
+          controller.close();
+        } else {
+          controller.enqueue(chunk.value);
+        }
+      });
+    },
+    cancel: function(reason) { if (reader) return reader.cancel(reason); }
+  });
+}
+
+/* Whisper works on 16 kHz mono internally, so uncompressed and lossless
+   uploads are decoded and re-encoded as 16 kHz mono 16-bit WAV (256 kbit/s)
+   in the browser first. Lossy formats are already at or below that rate, and
+   decoding holds the whole file in memory, so the choice is made up front:
+   only PCM/lossless types, and only below the streamed-upload threshold. */
+var PREPROCESS_MIN = 1024 * 1024;
+var PREPROCESS_RATE = 16000;
+var PREPROCESS_TYPES = /^audio\/(wav|wave|x-wav|vnd\.wave|flac|x-flac|aiff|x-aiff)$/;
+
+function encodeWav(samples, rate) {
+  var buffer = new ArrayBuffer(44 + samples.length * 2);
+  var view = new DataView(buffer);
+  function writeStr(offset, str) {
+    for (var i = 0; i < str.length; i++) view.setUint8(offset + i, str.charCodeAt(i));
+  }
+  writeStr(0, 'RIFF');
+  view.setUint32(4, 36 + samples.length * 2, true);
+  writeStr(8, 'WAVE');
+  writeStr(12, 'fmt ');
+  view.setUint32(16, 16, true);
+  view.setUint16(20, 1, true);          /* PCM */
+  view.setUint16(22, 1, true);          /* mono */
+  view.setUint32(24, rate, true);
+  view.setUint32(28, rate * 2, true);   /* byte rate */
+  view.setUint16(32, 2, true);          /* block align */
+  view.setUint16(34, 16, true);         /* bits per sample */
+  writeStr(36, 'data');
+  view.setUint32(40, samples.length * 2, true);
+  var pcm = new Int16Array(buffer, 44);
+  for (var j = 0; j < samples.length; j++) {
+    var s = Math.max(-1, Math.min(1, samples[j]));
+    pcm[j] = s < 0 ? s * 0x8000 : s * 0x7FFF;
+  }
+  return new Blob([buffer], { type: 'audio/wav' });
+}
+
+function preprocessAudio(file) {
+  var OfflineCtx = window.OfflineAudioContext || window.webkitOfflineAudioContext;
+  if (!preprocessToggle.checked || !OfflineCtx || file.size < PREPROCESS_MIN ||
+      file.size > STREAM_UPLOAD_MIN || !PREPROCESS_TYPES.test(file.type)) {
+    return Promise.resolve(file);
+  }
+  return file.arrayBuffer().then(function(data) {
+    /* decodeAudioData resamples to the context rate */
+    return new OfflineCtx(1, 1, PREPROCESS_RATE).decodeAudioData(data);
+  }).then(function(decoded) {
+    /* Rendering into a mono destination downmixes the channels */
+    var ctx = new OfflineCtx(1, Math.ceil(decoded.duration * PREPROCESS_RATE), PREPROCESS_RATE);
+    var source = ctx.createBufferSource();
+    source.buffer = decoded;
+    source.connect(ctx.destination);
+    source.start();
+    return ctx.startRendering();
+  }).then(function(rendered) {
+    var wav = encodeWav(rendered.getChannelData(0), PREPROCESS_RATE);
+    /* e.g. 8 kHz mono PCM grows when upsampled; keep the smaller */
+    if (wav.size >= file.size) return file;
+    return new File([wav], file.name.replace(/\.[^.]+$/, '') + '.wav', { type: 'audio/wav' });
+  }).catch(function() {
+    /* Undecodable in this browser — let the server handle the original */
+    return file;
+  });
+}
+
+function postTranscription(file, fields, signal) {
+  if (supportsRequestStreams && file.size > STREAM_UPLOAD_MIN) {
+    var boundary = '----fw' + Date.now().toString(36) + Math.random().toString(36).slice(2);
+    var headers = { 'Content-Type': 'multipart/form-data; boundary=' + boundary };
+    if (apiKey) headers['Authorization'] = AUTH_HEADERS['Authorization'];
+    return apiCall('/v1/audio/transcriptions', {
+      method: 'POST',
+      headers: headers,
+      body: multipartStream(boundary, fields, file),
+      duplex: 'half',
+      signal: signal
+    }, 'Transcription failed').catch(function(err) {
+      /* Request streams need HTTP/2, which surfaces as a network TypeError;
+         fall back to FormData from now on */
+      if (!(err instanceof TypeError)) throw err;
+      supportsRequestStreams = false;
+      return postTranscription(file, fields, signal);
+    });
+  }
+
+  var formData = new FormData();
+  formData.append('file', file);
+  for (var name in fields) formData.append(name, fields[name]);
+  return apiCall('/v1/audio/transcriptions', {
+    method: 'POST',
+    headers: AUTH_HEADERS,
+    body: formData,
+    signal: signal
+  }, 'Transcription failed');
+}
+
+/* Aborted by the Cancel button while a transcription is in flight */
+var transcribeController = null;
+
+function endTranscribe() {
+  transcribeController = null;
+  transcribeCancelBtn.classList.remove('visible');
+  transcribeBtn.disabled = false;
+  transcribeSpinner.className = 'btn-spinner';
+  transcribeBtnText.textContent = 'Transcribe';
+}
+
+function cancelTranscribe() {
+  if (transcribeController) transcribeController.abort();
+}
+
+function transcribe() {
+  if (!selectedFile || transcribeBtn.disabled) return;
+
+  var format = formatSelect.value;
+  var lang = langSelect.value;
+
+  /* Clear previous */
+  transcribeResult.classList.remove('visible');
+  resultText.textContent = '';
+  hideStatus(transcribeStatus);
+  transcriptionText = '';
+
+  /* Loading state */
+  transcribeBtn.disabled = true;
+  transcribeSpinner.className = 'btn-spinner visible';
+  transcribeBtnText.textContent = 'Transcribing...';
+  transcribeController = new AbortController();
+  transcribeCancelBtn.classList.add('visible');
+
+  var signal = transcribeController.signal;
+  var fields = { model: 'Systran/faster-whisper-base', response_format: format };
+  if (lang) fields.language = lang;
+
+  preprocessAudio(selectedFile)
+  .then(function(file) { return postTranscription(file, fields, signal); })
+  .then(function(res) {
+    if (!res) return;
+    if (format === 'json' || format === 'verbose_json') {
+      return res.json().then(function(data) { return { parsed: data, format: format }; });
+    }
+    return res.text().then(function(t) { return { text: t, format: format }; });
+  })
+  .then(function(result) {
+    if (!result) return;
+
+    var output = '';
+    if (result.parsed) {
+      if (result.format === 'json') {
+        output = result.parsed.text || JSON.stringify(result.parsed, null, 2);
+      } else {
+        output = JSON.stringify(result.parsed, null, 2);
+      }
+    } else {
+      output = result.text;
+    }
+
+    transcriptionText = output;
+    resultText.textContent = output;
+    transcribeResult.classList.add('visible');
+
+    /* Show download button for structured formats */
+    if (format === 'srt' || format === 'vtt' || format === 'json' || format === 'verbose_json') {
+      downloadTextBtn.style.display = '';
+    } else {
+      downloadTextBtn.style.display = 'none';
+    }
+
+    endTranscribe();
+  })
+  .catch(function(err) {
+    /* A cancelled request needs no error message */
+    if (err.name !== 'AbortError') showStatus(transcribeStatus, friendlyError(err), 'error');
+    endTranscribe();
+  });
+}
+
+/* Copy button */
+function copyTranscription() {
+  if (transcriptionText) {
+    var span = copyBtn.querySelector('span');
+    copyToClipboard(transcriptionText, span);
+  }
+}
+
+/* Download text button */
+function downloadTranscription() {
+  if (!transcriptionText) return;
+  var format = formatSelect.value;
+  var ext = format;
+  if (format === 'verbose_json') ext = 'json';
+  var mime = 'text/plain';
+  if (ext === 'json') mime = 'application/json';
+  if (ext === 'srt') mime = 'text/srt';
+  if (ext === 'vtt') mime = 'text/vtt';
+  var baseName = selectedFile ? selectedFile.name.replace(/\.[^.]+$/, '') : 'transcription';
+  triggerDownload(new Blob([transcriptionText], { type: mime }), baseName + '.' + ext);
+}
+
+/* =============================================
+   TTS — Controls
+   ============================================= */
+var ttsInput = document.getElementById('ttsInput');
+var voiceSelect = document.getElementById('voiceSelect');
+var speedSlider = document.getElementById('speedSlider');
+var speedValue = document.getElementById('speedValue');
+var ttsBtn = document.getElementById('ttsBtn');
+var ttsSpinner = document.getElementById('ttsSpinner');
+var ttsBtnText = document.getElementById('ttsBtnText');
+var ttsStatus = document.getElementById('ttsStatus');
+var ttsResult = document.getElementById('ttsResult');
+var ttsAudio = document.getElementById('ttsAudio');
+
+var ttsAudioBlob = null;
+var ttsAudioUrl = null;
+var retiredAudioUrl = null;
+
+/* Where MediaSource can play MP3, speech plays while it is still streaming
+   in instead of after the whole response has been buffered */
+var canStreamAudio = !!(window.MediaSource && MediaSource.isTypeSupported('audio/mpeg'));
+
+/* Replacing ttsAudio.src empties the element; only then is the previous
+   clip's object URL no longer in use */
+ttsAudio.addEventListener('emptied', function() {
+  if (retiredAudioUrl) { URL.revokeObjectURL(retiredAudioUrl); retiredAudioUrl = null; }
+});
+
+/* Coalesce slider drags to one label update per frame */
+var speedFrame = 0;
+speedSlider.addEventListener('input', function() {
+  if (speedFrame) return;
+  speedFrame = requestAnimationFrame(function() {
+    speedFrame = 0;
+    speedValue.textContent = parseFloat(speedSlider.value).toFixed(1) + 'x';
+  });
+});
+
+ttsInput.addEventListener('input', function() {
+  ttsBtn.disabled = !this.value.trim();
+});
+
+/* =============================================
+   TTS — API call
+   ============================================= */
+function showAudio(url) {
+  retiredAudioUrl = ttsAudioUrl;
+  ttsAudioUrl = url;
+  ttsAudio.src = url;
+  ttsResult.classList.add('visible');
+}
+
+function streamAudio(res) {
+  var mediaSource = new MediaSource();
+  var chunks = [];
+  showAudio(URL.createObjectURL(mediaSource));
+  return new Promise(function(resolve, reject) {
+    mediaSource.addEventListener('sourceopen', function() {
+      var sourceBuffer;
+      var reader;
+      /* Set once the SourceBuffer hits the browser's quota; the rest of
+         the stream is only collected and played back as a Blob */
+      var overflowed = false;
+
+      function finish() {
+        /* The chunks double as the file behind the download button */
+        var blob = new Blob(chunks, { type: 'audio/mpeg' });
+        if (overflowed) {
+          showAudio(URL.createObjectURL(blob));
+        } else {
+          mediaSource.endOfStream();
+        }
+        resolve(blob);
+      }
+
+      function pump() {
+        reader.read().then(function(chunk) {
+          if (chunk.done) {
+            finish();
+            return;
+          }
+          chunks.push(chunk.value);
+          if (overflowed) {
+            pump();
+            return;
+          }
+          try {
+            sourceBuffer.appendBuffer(chunk.value);
+          } catch(e) {
+            if (e.name !== 'QuotaExceededError') throw e;
+            overflowed = true;
+            pump();
+          }
+        }).catch(reject);
+      }
+
+      try {
+        sourceBuffer = mediaSource.addSourceBuffer('audio/mpeg');
+        reader = res.body.getReader();
+        sourceBuffer.addEventListener('updateend', pump);
+        sourceBuffer.addEventListener('error', function() {
+          reject(new Error('Audio playback failed'));
+        });
+        pump();
+      } catch(e) {
+        reject(e);
+      }
+    }, { once: true });
+  });
+}
+
+function generateSpeech() {
+  var text = ttsInput.value.trim();
+  if (!text || ttsBtn.disabled) return;
+
+  /* Clear previous */
+  hideStatus(ttsStatus);
+  ttsResult.classList.remove('visible');
+
+  /* Loading state */
+  ttsBtn.disabled = true;
+  ttsSpinner.className = 'btn-spinner visible';
+  ttsBtnText.textContent = 'Generating...';
+  ttsAudioBlob = null;
+
+  apiCall('/v1/audio/speech', {
+    method: 'POST',
+    headers: TTS_HEADERS,
+    body: JSON.stringify({
+      input: text,
+      model: 'tts-1',
+      voice: voiceSelect.value,
+      speed: parseFloat(speedSlider.value),
+      response_format: 'mp3'
+    })
+  }, 'Speech generation failed')
+  .then(function(res) {
+    if (!res) return;
+    if (canStreamAudio && res.body) return streamAudio(res);
+    return res.blob().then(function(blob) {
+      showAudio(URL.createObjectURL(blob));
+      return blob;
+    });
+  })
+  .then(function(blob) {
+    if (!blob) return;
+    ttsAudioBlob = blob;
+
+    /* Reset button */
+    ttsBtn.disabled = false;
+    ttsSpinner.className = 'btn-spinner';
+    ttsBtnText.textContent = 'Generate Speech';
+  })
+  .catch(function(err) {
+    showStatus(ttsStatus, friendlyError(err), 'error');
+    ttsBtn.disabled = false;
+    ttsSpinner.className = 'btn-spinner';
+    ttsBtnText.textContent = 'Generate Speech';
+  });
+}
+
+/* Download audio */
+function downloadSpeech() {
+  if (!ttsAudioBlob) return;
+  triggerDownload(ttsAudioBlob, 'speech.mp3');
+}
+
+/* =============================================
+   Click dispatch
+   ============================================= */
+/* One delegated listener; buttons name their handler with data-action */
+var ACTIONS = {
+  signOut: signOut,
+  tabTranscribe: function() { switchTab(0); },
+  tabTts: function() { switchTab(1); },
+  removeFile: clearFile,
+  transcribe: transcribe,
+  cancelTranscribe: cancelTranscribe,
+  copy: copyTranscription,
+  downloadText: downloadTranscription,
+  tts: generateSpeech,
+  downloadAudio: downloadSpeech
+};
+
+document.addEventListener('click', function(e) {
+  var target = e.target.closest('[data-action]');
+  if (target) ACTIONS[target.getAttribute('data-action')](e);
+});
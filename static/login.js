@@ -0,0 +1,58 @@
+var form = document.getElementById('loginForm');
+var input = document.getElementById('keyInput');
+var btn = document.getElementById('submitBtn');
+var btnText = document.getElementById('btnText');
+var spinner = document.getElementById('spinner');
+var msg = document.getElementById('msg');
+var eyeIcon = document.getElementById('eyeIcon');
+
+document.getElementById('toggleBtn').addEventListener('click', function() {
+  var isPassword = input.type === 'password';
+  input.type = isPassword ? 'text' : 'password';
+  this.setAttribute('aria-label', isPassword ? 'Hide key' : 'Show key');
+});
+
+function showMsg(text, type) {
+  msg.textContent = text;
+  msg.className = 'msg ' + type;
+}
+
+function hideMsg() {
+  msg.className = 'msg';
+  msg.textContent = '';
+}
+
+function setLoading(loading) {
+  btn.disabled = loading;
+  spinner.className = loading ? 'btn-spinner visible' : 'btn-spinner';
+  btnText.textContent = loading ? 'Verifying…' : 'Sign in';
+}
+
+form.addEventListener('submit', function(e) {
+  e.preventDefault();
+  var key = input.value.trim();
+  if (!key) return;
+
+  setLoading(true);
+  hideMsg();
+
+  fetch('/auth/validate', {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ key: key })
+  })
+  .then(function(res) {
+    if (res.ok) {
+      try { localStorage.setItem('speaches_api_key', key); } catch (_) {}
+      showMsg('Authenticated! Redirecting…', 'success');
+      setTimeout(function() { window.location.href = '/'; }, 600);
+    } else {
+      showMsg('Invalid API key. Check your Railway Variables tab and try again.', 'error');
+      setLoading(false);
+    }
+  })
+  .catch(function() {
+    showMsg('Connection error. Please try again.', 'error');
+    setLoading(false);
+  });
+});